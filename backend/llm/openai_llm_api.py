@@ -4,8 +4,24 @@ import os
 from dotenv import load_dotenv
 import re
 
+from backend.singleflight import SingleFlight, normalize_key
+
 load_dotenv()
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+OPENAI_KEY = os.getenv("OPENAI_API_KEY")
+# Anahtar yoksa istemci kurulmaz; yerel STT/TTS ile çalışırken import hata vermesin
+client = OpenAI(api_key=OPENAI_KEY) if OPENAI_KEY else None
+
+# Sabit cevaplar: açılışta önceden seslendirilir (backend/tts/prerender.py)
+IDENTITY_TEXT = "Ben GaziAI, Gazi Üniversitesi yapay zeka topluluğu tarafından geliştirildim."
+NO_ANSWER_TEXT = "Cevap alınamadı."
+ERROR_TEXT = "Bir hata oluştu, tekrar deneyin."
+
+# Aynı soruyu eşzamanlı soran ziyaretçiler tek bir upstream çağrısını paylaşır;
+# hata cevapları pencerede tutulmaz, tek bir upstream hatası herkese tekrar edilmesin
+_inflight = SingleFlight(
+    window=float(os.getenv("LLM_COALESCE_WINDOW_MS", "0")) / 1000.0,
+    keep=lambda answer: bool(answer) and answer not in (ERROR_TEXT, NO_ANSWER_TEXT),
+)
 
 def clean_text(text: str) -> str:
     if not text:
@@ -15,11 +31,17 @@ def clean_text(text: str) -> str:
     return text
 
 def ask_openai(prompt: str) -> str:
+    return _inflight.do(normalize_key(clean_text(prompt)), _ask_openai, prompt)
+
+def _ask_openai(prompt: str) -> str:
+    if client is None:
+        print("[OpenAI Hatası] OPENAI_API_KEY tanımlı değil")
+        return ERROR_TEXT
     try:
         response = client.chat.completions.create(  
             model="gpt-4o-mini",  
             messages=[
-                {"role": "system", "content": "If the the user asks you your name or who you are, respond like: 'Ben GaziAI, Gazi Üniversitesi yapay zeka topluluğu tarafından geliştirildim.' Respond to user queries with short answers in the style of a cheerful, warm-hearted person who is full of life. Keep your answers short and simple. Do not use emojis at any time. Always sound friendly, approachable, and kind, maintaining a positive, uplifting, and light tone in every response. Make the user feel comfortable, safe, and happy—your aim is to create a welcoming, supportive environment. Frequently use affectionate Turkish expressions such as 'koçum','aslanım' etc. in a natural way within your replies. Occasionally include a gentle chuckle to reinforce the lighthearted and lively personality. Ensure all communication remains warm and encouraging, never negative or dismissive. All responses must be concise, focusing on clear, friendly answers. Do not offer the user any additional information or suggestions, just answer the question."},
+                {"role": "system", "content": "If the the user asks you your name or who you are, respond like: '" + IDENTITY_TEXT + "' Respond to user queries with short answers in the style of a cheerful, warm-hearted person who is full of life. Keep your answers short and simple. Do not use emojis at any time. Always sound friendly, approachable, and kind, maintaining a positive, uplifting, and light tone in every response. Make the user feel comfortable, safe, and happy—your aim is to create a welcoming, supportive environment. Frequently use affectionate Turkish expressions such as 'koçum','aslanım' etc. in a natural way within your replies. Occasionally include a gentle chuckle to reinforce the lighthearted and lively personality. Ensure all communication remains warm and encouraging, never negative or dismissive. All responses must be concise, focusing on clear, friendly answers. Do not offer the user any additional information or suggestions, just answer the question."},
                 {"role": "user", "content": prompt}
             ],
             temperature=1,
@@ -29,11 +51,11 @@ def ask_openai(prompt: str) -> str:
         if response.choices and len(response.choices) > 0:
             answer = response.choices[0].message.content  # Düzelt: choices[0].message.content
             return clean_text(answer)
-        return "Cevap alınamadı."
+        return NO_ANSWER_TEXT
 
     except Exception as e:
         print(f"[OpenAI Hatası] {e}")
-        return "Bir hata oluştu, tekrar deneyin."
+        return ERROR_TEXT
 
 if __name__ == "__main__":
     test_sorusu = "Zonguldak nasıl bir yer?"
@@ -2,6 +2,8 @@
 import os
 import sys
 import base64
+import threading
+import uuid
 
 import cv2
 import numpy as np
@@ -14,9 +16,10 @@ root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if root_dir not in sys.path:
     sys.path.append(root_dir)
 
-from backend.stt.openai_stt import transcribe_file
-from backend.llm.openai_llm_api import ask_openai
-from backend.tts.tts_api import tts_to_file
+from backend.stt import engine as stt_engine
+from backend.llm.openai_llm_api import ask_openai, ERROR_TEXT, IDENTITY_TEXT, NO_ANSWER_TEXT
+from backend.tts import engine as tts_engine
+from backend.tts import prerender as tts_prerender
 
 # Optional subsystems: keep flags so we can degrade gracefully if modules fail later
 try:
@@ -31,6 +34,9 @@ except ImportError:
     print("Warning: LLM modules failed to load")
     llm_available = False
 
+LLM_DISABLED_TEXT = "Hello, how can I help?"
+LLM_FAILURE_TEXT = "There was an error, please try again."
+
 ENABLE_CV = os.getenv("ENABLE_COMPUTER_VISION", "true").lower() == "true"
 CV_MODE = os.getenv("CV_MODE", "full").lower()
 if CV_MODE not in {"full", "lite"}:
@@ -54,6 +60,8 @@ DEFAULT_CV_DATA = {
 }
 
 last_detection_results = DEFAULT_CV_DATA.copy()
+# İstek thread'leri arasında paylaşılan son CV sonucu
+detection_results_lock = threading.Lock()
 
 cv_available = False
 object_detector = None
@@ -63,6 +71,7 @@ if ENABLE_CV:
     if CV_MODE == "lite":
         try:
             from computer_vision.object_detector import ObjectDetector  # type: ignore
+            from computer_vision.frame_buffers import frame_pool  # type: ignore
 
             object_detector = ObjectDetector(
                 enable_pose=False,
@@ -113,6 +122,27 @@ try:
 except ValueError:
     app.config["MAX_CONTENT_LENGTH"] = 10 * 1024 * 1024
 
+
+def preload_speech_engines():
+    # Hata/yedek cevaplar yavaşlık anında uzak TTS çağrısı beklemesin. Ön seslendirme
+    # kendi thread'inde başlar; yavaş bir STT model yüklemesi (ilk açılışta indirme)
+    # bu cümlelerin hazırlanmasını geciktirmez
+    phrases = tts_prerender.phrase_list([
+        LLM_DISABLED_TEXT,
+        LLM_FAILURE_TEXT,
+        ERROR_TEXT,
+        NO_ANSWER_TEXT,
+        IDENTITY_TEXT,
+    ])
+    tts_engine.prerender_phrases(phrases)
+    # Yerel STT/TTS modellerini arka planda yükle; ilk istek model yüklemesini beklemesin
+    stt_engine.preload()
+    tts_engine.preload()
+
+
+threading.Thread(target=preload_speech_engines, name="speech-preload", daemon=True).start()
+
+
 def initialize_camera():
     try:
         if cv_available and detection_system:
@@ -144,26 +174,32 @@ def upload_audio():
             return jsonify({"error": "No audio file"}), 400
 
         audio_file = request.files["audio"]
+        requested_stt = request.form.get("stt_engine")
+        requested_tts = request.form.get("tts_engine")
         filename = secure_filename(audio_file.filename)
-        temp_path = os.path.join(app.config["UPLOAD_FOLDER"], f"temp_{filename}")
+        # İstemciler hep aynı dosya adını gönderir; eşzamanlı yüklemeler birbirini ezmesin
+        temp_path = os.path.join(app.config["UPLOAD_FOLDER"], f"temp_{uuid.uuid4().hex}_{filename}")
         audio_file.save(temp_path)
 
         try:
-            transcript = transcribe_file(temp_path) if stt_available else "[STT disabled]"
+            transcript = stt_engine.transcribe(temp_path, requested_stt) if stt_available else "[STT disabled]"
             print(f"Transcript: {transcript}")
         except Exception as exc:
             print(f"STT error: {exc}")
             transcript = "[STT error]"
 
         try:
-            response_text = ask_openai(transcript) if llm_available else "Hello, how can I help?"
+            response_text = ask_openai(transcript) if llm_available else LLM_DISABLED_TEXT
             print(f"LLM response: {response_text}")
         except Exception as exc:
             print(f"LLM error: {exc}")
-            response_text = "There was an error, please try again."
+            response_text = LLM_FAILURE_TEXT
 
         try:
-            wav_path = tts_to_file(response_text)
+            wav_path = tts_engine.synthesize(response_text, requested_tts)
+            if not wav_path or not os.path.exists(wav_path):
+                # TTS çalışmıyorsa hangi sesle olursa olsun önceden seslendirilmiş hata mesajını çal
+                wav_path = tts_prerender.lookup(LLM_FAILURE_TEXT)
             if not wav_path or not os.path.exists(wav_path):
                 raise RuntimeError("TTS output missing")
 
@@ -219,22 +255,29 @@ def process_frame():
             raise ValueError("Decoded frame is empty")
 
         inference_frame = frame
-        resized = False
-        if CV_MODE == "lite":
-            inference_frame = cv2.resize(frame, (320, 240))
-            resized = True
+        pooled_frame = None
+        try:
+            if CV_MODE == "lite":
+                pooled_frame = frame_pool.acquire((240, 320, 3))
+                inference_frame = cv2.resize(frame, (320, 240), dst=pooled_frame)
 
-        processed_frame, results = object_detector.detect_objects(inference_frame)
+            # Çizimler inference_frame üzerine yerinde yapılır
+            processed_frame, results = object_detector.detect_objects(inference_frame)
 
-        if resized:
-            processed_frame = cv2.resize(processed_frame, (frame.shape[1], frame.shape[0]))
+            if pooled_frame is not None:
+                # Decode edilen frame artık kullanılmıyor; büyütme hedefi olarak onu kullan
+                processed_frame = cv2.resize(processed_frame, (frame.shape[1], frame.shape[0]), dst=frame)
+        finally:
+            if pooled_frame is not None:
+                frame_pool.release(pooled_frame)
 
         payload = DEFAULT_CV_DATA.copy()
         for key in payload:
             if key in results:
                 payload[key] = results[key]
 
-        last_detection_results = payload.copy()
+        with detection_results_lock:
+            last_detection_results = payload.copy()
 
         _, buffer = cv2.imencode(".jpg", processed_frame)
         processed_frame_base64 = base64.b64encode(buffer).decode("utf-8")
@@ -268,7 +311,8 @@ def get_detection_results():
             for key in payload:
                 if key in results:
                     payload[key] = results[key]
-            last_detection_results = payload.copy()
+            with detection_results_lock:
+                last_detection_results = payload.copy()
             return jsonify({
                 "success": True,
                 **payload,
@@ -277,9 +321,11 @@ def get_detection_results():
         except Exception as exc:
             return jsonify({"success": False, "error": str(exc), "cv_mode": CV_MODE})
 
+    with detection_results_lock:
+        cached = last_detection_results.copy()
     return jsonify({
         "success": True,
-        **last_detection_results,
+        **cached,
         "cv_mode": CV_MODE,
     })
 
@@ -0,0 +1,78 @@
+# backend/singleflight.py - Eşzamanlı aynı çağrıları tek upstream isteğinde birleştir
+import re
+import threading
+import time
+
+
+def normalize_key(text: str) -> str:
+    """Büyük/küçük harf ve boşluk farklarını yok sayan anahtar üret."""
+    if not text:
+        return ""
+    text = re.sub(r"\s+", " ", text).strip()
+    return text.casefold()
+
+
+class _Call:
+    __slots__ = ("event", "result", "error", "done_at")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+        self.done_at = None
+
+
+class SingleFlight:
+    """Aynı anahtarla gelen eşzamanlı çağrılar tek bir fn çağrısını bekler.
+
+    window > 0 ise biten sonuç bu süre (saniye) boyunca yeni gelenlerle de
+    paylaşılır; böylece ani yüklerde kısa arayla gelen kopyalar da birleşir.
+    Exception'lar ve keep(result) False dönen sonuçlar (varsayılan: boş sonuçlar)
+    pencerede tutulmaz, bir sonraki çağrı yeniden dener. Hata durumunda exception
+    yerine yedek değer döndüren fonksiyonlar bu değerleri keep ile dışlamalıdır.
+    """
+
+    def __init__(self, window: float = 0.0, keep=bool):
+        self.window = window
+        self.keep = keep
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn, *args, **kwargs):
+        with self._lock:
+            now = time.monotonic()
+            if self.window > 0:
+                self._expire(now)
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            call.done_at = time.monotonic()
+            with self._lock:
+                keep = self.window > 0 and call.error is None and self.keep(call.result)
+                if not keep and self._calls.get(key) is call:
+                    del self._calls[key]
+            call.event.set()
+        return call.result
+
+    def _expire(self, now: float):
+        expired = [
+            key for key, call in self._calls.items()
+            if call.done_at is not None and now - call.done_at >= self.window
+        ]
+        for key in expired:
+            del self._calls[key]
@@ -0,0 +1,75 @@
+# stt/engine.py - STT motor seçimi (openai / local), ön yükleme ve thread havuzu
+import os
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+from backend.stt import local_stt, openai_stt
+
+ENGINES = {
+    "openai": openai_stt,
+    "local": local_stt,
+}
+
+# openai_stt hata durumunda exception yerine bu işaretleri döndürür
+FAILED_RESULTS = {"[Anlaşılamadı]", "[Desteklenmeyen dosya formatı]"}
+
+DEFAULT_ENGINE = os.getenv("STT_ENGINE", "openai").lower()
+FALLBACK_ENGINE = os.getenv("STT_FALLBACK_ENGINE", "openai").lower()
+STT_TIMEOUT = float(os.getenv("STT_TIMEOUT_S", "30"))
+
+# Her motorun kendi havuzu var; takılan bir motor yedek motorun sırasını tıkamasın
+_executors = {
+    name: ThreadPoolExecutor(
+        max_workers=max(int(os.getenv("STT_WORKERS", "8")), 1),
+        thread_name_prefix=f"stt-{name}",
+    )
+    for name in ENGINES
+}
+
+
+def engine_chain(engine=None) -> list:
+    """İstenen motor, varsayılan motor ve yedek motoru sırayla döndür."""
+    chain = []
+    for name in (engine, DEFAULT_ENGINE, FALLBACK_ENGINE):
+        name = (name or "").strip().lower()
+        if name in ENGINES and name not in chain and ENGINES[name].is_available():
+            chain.append(name)
+    return chain
+
+
+def preload():
+    """Zincirdeki yerel modelleri ilk istekten önce belleğe al."""
+    for name in engine_chain():
+        loader = getattr(ENGINES[name], "load_model", None)
+        if loader is None:
+            continue
+        try:
+            loader()
+        except Exception as exc:
+            print(f"STT ön yükleme hatası ({name}): {exc}")
+
+
+def transcribe(path: str, engine=None) -> str:
+    chain = engine_chain(engine)
+    if not chain:
+        raise RuntimeError("Kullanılabilir STT motoru yok")
+
+    text = "[Anlaşılamadı]"
+    for name in chain:
+        future = _executors[name].submit(ENGINES[name].transcribe_file, path)
+        try:
+            text = future.result(timeout=STT_TIMEOUT)
+        except FutureTimeout:
+            # Henüz başlamadıysa hiç çalışmasın; başladıysa sonucu yok sayılır
+            future.cancel()
+            print(f"STT zaman aşımı ({name}), sonraki motora geçiliyor")
+            continue
+        except FileNotFoundError:
+            raise
+        except Exception as exc:
+            print(f"STT Hatası ({name}): {exc}")
+            continue
+        # Boş metin başarılı bir sonuçtur (sessizlik/gürültü); yedek motora yalnızca
+        # hata, zaman aşımı ya da hata işaretinde geçilir
+        if text not in FAILED_RESULTS:
+            return text or "[Anlaşılamadı]"
+    return text
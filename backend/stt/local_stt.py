@@ -0,0 +1,60 @@
+# stt/local_stt.py - CPU-only Whisper (faster-whisper, int8) for on-device STT
+import os
+import threading
+
+try:
+    from faster_whisper import WhisperModel
+except ImportError:
+    WhisperModel = None
+
+LOCAL_STT_MODEL = os.getenv("LOCAL_STT_MODEL", "small")
+LOCAL_STT_COMPUTE_TYPE = os.getenv("LOCAL_STT_COMPUTE_TYPE", "int8")
+LOCAL_STT_CPU_THREADS = int(os.getenv("LOCAL_STT_CPU_THREADS", "0"))
+LOCAL_STT_LANGUAGE = os.getenv("LOCAL_STT_LANGUAGE", "tr")
+# Aynı anda çalışabilecek çıkarım sayısı; STT_WORKERS havuzundaki fazlası sırada bekler
+LOCAL_STT_WORKERS = int(os.getenv("LOCAL_STT_WORKERS", "2"))
+
+_model = None
+_model_lock = threading.Lock()
+
+
+def is_available() -> bool:
+    return WhisperModel is not None
+
+
+def load_model():
+    """Modeli bir kez yükle; eşzamanlı çağrılar aynı örneği paylaşır."""
+    global _model
+    if _model is not None:
+        return _model
+    if WhisperModel is None:
+        raise RuntimeError("faster-whisper kurulu değil (pip install faster-whisper)")
+
+    with _model_lock:
+        if _model is None:
+            _model = WhisperModel(
+                LOCAL_STT_MODEL,
+                device="cpu",
+                compute_type=LOCAL_STT_COMPUTE_TYPE,
+                cpu_threads=LOCAL_STT_CPU_THREADS,
+                num_workers=max(LOCAL_STT_WORKERS, 1),
+            )
+            print(f"Yerel STT modeli yüklendi: {LOCAL_STT_MODEL} ({LOCAL_STT_COMPUTE_TYPE})")
+    return _model
+
+
+def transcribe_file(path: str) -> str:
+    if not os.path.exists(path):
+        raise FileNotFoundError(path)
+
+    # faster-whisper PyAV ile kendi çözümlemesini yapar, FFmpeg dönüşümü gerekmez
+    model = load_model()
+    segments, _info = model.transcribe(
+        path,
+        language=LOCAL_STT_LANGUAGE,
+        beam_size=1,
+        vad_filter=True,
+    )
+    text = " ".join(segment.text.strip() for segment in segments)
+    print(f"Yerel STT Başarılı: '{text}'")
+    return text.strip()
@@ -3,11 +3,17 @@ import shutil
 import subprocess
 from openai import OpenAI
 import tempfile
+import uuid
 
 OPENAI_KEY = os.getenv("OPENAI_API_KEY")
 if not OPENAI_KEY:
     print("❗ Uyarı: OPENAI_API_KEY ortam değişkeni yok. Lütfen setx/open .env ile ayarla.")
-client = OpenAI(api_key=OPENAI_KEY)
+# Anahtar yoksa istemci kurulmaz (OpenAI() import anında hata verir); motor zincirden düşer
+client = OpenAI(api_key=OPENAI_KEY) if OPENAI_KEY else None
+
+
+def is_available() -> bool:
+    return bool(OPENAI_KEY)
 
 
 def _has_ffmpeg():
@@ -43,7 +49,7 @@ def transcribe_file(path: str) -> str:
 
     # Geçici dosya için güvenli bir yol oluştur
     temp_dir = tempfile.gettempdir()
-    temp_wav = os.path.join(temp_dir, "temp_audio.wav")
+    temp_wav = os.path.join(temp_dir, f"temp_audio_{uuid.uuid4().hex}.wav")
 
     # Desteklenen formatlar
     supported_formats = ['.wav', '.mp3', '.m4a', '.webm', '.ogg', '.flac', '.mp4', '.mpeg', '.mpga', '.oga']
@@ -0,0 +1,103 @@
+# tts/engine.py - TTS motor seçimi (openai / local), ön yükleme ve thread havuzu
+import os
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+from backend.singleflight import SingleFlight, normalize_key
+from backend.tts import local_tts, prerender, tts_api
+
+ENGINES = {
+    "openai": tts_api,
+    "local": local_tts,
+}
+
+DEFAULT_ENGINE = os.getenv("TTS_ENGINE", "openai").lower()
+FALLBACK_ENGINE = os.getenv("TTS_FALLBACK_ENGINE", "openai").lower()
+TTS_TIMEOUT = float(os.getenv("TTS_TIMEOUT_S", "30"))
+# Aynı metin için biten sonucu bu süre boyunca yeni isteklerle de paylaş
+TTS_COALESCE_WINDOW = float(os.getenv("TTS_COALESCE_WINDOW_MS", "1000")) / 1000.0
+
+# Her motorun kendi havuzu var; takılan bir motor yedek motorun sırasını tıkamasın
+_executors = {
+    name: ThreadPoolExecutor(
+        max_workers=max(int(os.getenv("TTS_WORKERS", "8")), 1),
+        thread_name_prefix=f"tts-{name}",
+    )
+    for name in ENGINES
+}
+_inflight = SingleFlight(window=TTS_COALESCE_WINDOW)
+
+
+def engine_chain(engine=None) -> list:
+    """İstenen motor, varsayılan motor ve yedek motoru sırayla döndür."""
+    chain = []
+    for name in (engine, DEFAULT_ENGINE, FALLBACK_ENGINE):
+        name = (name or "").strip().lower()
+        if name in ENGINES and name not in chain and ENGINES[name].is_available():
+            chain.append(name)
+    return chain
+
+
+def preload():
+    """Zincirdeki yerel sesleri ilk istekten önce belleğe al."""
+    for name in engine_chain():
+        loader = getattr(ENGINES[name], "load_model", None)
+        if loader is None:
+            continue
+        try:
+            loader()
+        except Exception as exc:
+            print(f"TTS ön yükleme hatası ({name}): {exc}")
+
+
+def prerender_phrases(phrases: list):
+    """Sabit cümleleri varsayılan zincirin ilk motoruyla arka planda seslendir."""
+    chain = engine_chain()
+    if not chain:
+        return None
+    return prerender.start(phrases, chain[0], ENGINES[chain[0]])
+
+
+def synthesize(text: str, engine=None) -> str:
+    """Metni ilk başarılı motorla seslendir; dosya yolunu ya da "" döndür.
+
+    Zincirin ilk motoruyla önceden seslendirilmiş cümleler uzak çağrı yapmadan
+    hemen döner; aynı metin ve motor zinciri için eşzamanlı istekler tek
+    sentezi paylaşır.
+    """
+    chain = engine_chain(engine)
+    if not chain:
+        return ""
+    pinned = prerender.lookup(text, chain[0])
+    if pinned:
+        return pinned
+
+    key = (tuple(chain), normalize_key(text))
+    return _inflight.do(key, _synthesize, text, chain)
+
+
+def _discard_output(future):
+    """Zaman aşımına uğramış, sonradan biten sentezin dosyasını sil."""
+    if future.cancelled() or future.exception() is not None:
+        return
+    wav_path = future.result()
+    if wav_path and os.path.exists(wav_path):
+        os.remove(wav_path)
+
+
+def _synthesize(text: str, chain: list) -> str:
+    for name in chain:
+        future = _executors[name].submit(ENGINES[name].tts_to_file, text)
+        try:
+            wav_path = future.result(timeout=TTS_TIMEOUT)
+        except FutureTimeout:
+            # Henüz başlamadıysa hiç çalışmasın; başladıysa çıktısı bitince silinir
+            if not future.cancel():
+                future.add_done_callback(_discard_output)
+            print(f"TTS zaman aşımı ({name}), sonraki motora geçiliyor")
+            continue
+        except Exception as exc:
+            print(f"❌ TTS hatası ({name}): {exc}")
+            continue
+        if wav_path and os.path.exists(wav_path):
+            return wav_path
+    return ""
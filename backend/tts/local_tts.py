@@ -0,0 +1,68 @@
+# tts/local_tts.py - CPU-only Piper sesi ile yerel TTS
+import os
+import threading
+import time
+import uuid
+import wave
+
+from backend.tts.tts_api import RESULT_DIR, ROOT_DIR, _slugify
+
+try:
+    from piper import PiperVoice
+except ImportError:
+    PiperVoice = None
+
+LOCAL_TTS_VOICE = os.getenv(
+    "LOCAL_TTS_VOICE",
+    os.path.join(ROOT_DIR, "models", "tr_TR-dfki-medium.onnx"),
+)
+
+_voice = None
+_voice_lock = threading.Lock()
+
+
+def is_available() -> bool:
+    return PiperVoice is not None and os.path.exists(LOCAL_TTS_VOICE)
+
+
+def voice_id() -> str:
+    """Ses çıktısını belirleyen ayarların özeti; ön seslendirilmiş dosyaların anahtarı."""
+    try:
+        stamp = int(os.path.getmtime(LOCAL_TTS_VOICE))
+    except OSError:
+        stamp = 0
+    return f"local:{os.path.basename(LOCAL_TTS_VOICE)}:{stamp}"
+
+
+def load_model():
+    """Piper sesini bir kez yükle; eşzamanlı çağrılar aynı örneği paylaşır."""
+    global _voice
+    if _voice is not None:
+        return _voice
+    if PiperVoice is None:
+        raise RuntimeError("piper-tts kurulu değil (pip install piper-tts)")
+
+    with _voice_lock:
+        if _voice is None:
+            _voice = PiperVoice.load(LOCAL_TTS_VOICE)
+            print(f"Yerel TTS sesi yüklendi: {os.path.basename(LOCAL_TTS_VOICE)}")
+    return _voice
+
+
+def tts_to_file(text: str) -> str:
+    voice = load_model()
+    base = _slugify(text[:32])
+    filename = os.path.join(RESULT_DIR, f"{base}_{int(time.time())}_{uuid.uuid4().hex[:8]}.wav")
+    try:
+        with wave.open(filename, "wb") as wav_file:
+            # piper-tts >= 1.3 synthesize_wav, eski sürümler synthesize kullanır
+            if hasattr(voice, "synthesize_wav"):
+                voice.synthesize_wav(text, wav_file)
+            else:
+                voice.synthesize(text, wav_file)
+        return filename
+    except Exception as e:
+        print("❌ Yerel TTS hatası:", e)
+        if os.path.exists(filename):
+            os.remove(filename)
+        return ""
@@ -0,0 +1,103 @@
+# tts/prerender.py - Sabit cümleleri açılışta seslendir ve sabitlenmiş (pinned) tut
+import hashlib
+import os
+import threading
+
+from backend.singleflight import normalize_key
+from backend.tts.tts_api import RESULT_DIR, _slugify
+
+ENABLE_TTS_PRERENDER = os.getenv("ENABLE_TTS_PRERENDER", "true").lower() == "true"
+PINNED_PREFIX = "pinned_"
+
+_pinned = {}
+_pinned_lock = threading.Lock()
+
+
+def _phrase_key(text: str) -> str:
+    # LLM çıktısı sondaki noktalamayı atlayabilir; eşleşmeyi bozmasın
+    return normalize_key(text).rstrip(" .!?")
+
+
+def pinned_path(text: str, voice: str) -> str:
+    """Cümle ve ses için kalıcı dosya yolu.
+
+    Yeniden başlatmalarda aynı dosya kullanılır; motor, ses ya da talimatlar
+    değişirse voice da değiştiği için cümle yeniden seslendirilir.
+    """
+    digest = hashlib.sha1(f"{voice}\n{_phrase_key(text)}".encode("utf-8")).hexdigest()[:10]
+    return os.path.join(RESULT_DIR, f"{PINNED_PREFIX}{_slugify(text[:32])}_{digest}.wav")
+
+
+def phrase_list(defaults: list) -> list:
+    """Varsayılan cümlelere TTS_PRERENDER_PHRASES (| ile ayrılmış) ve TTS_PRERENDER_FILE ekle."""
+    phrases = list(defaults)
+    extra = os.getenv("TTS_PRERENDER_PHRASES", "")
+    phrases.extend(p.strip() for p in extra.split("|") if p.strip())
+
+    phrase_file = os.getenv("TTS_PRERENDER_FILE")
+    if phrase_file and os.path.exists(phrase_file):
+        with open(phrase_file, encoding="utf-8") as f:
+            phrases.extend(line.strip() for line in f if line.strip())
+
+    unique = []
+    seen = set()
+    for phrase in phrases:
+        key = _phrase_key(phrase)
+        if key and key not in seen:
+            seen.add(key)
+            unique.append(phrase)
+    return unique
+
+
+def lookup(text: str, engine=None) -> str:
+    """engine ile seslendirilmiş dosya varsa yolunu, yoksa "" döndür.
+
+    engine None ise hangi motorla seslendirildiğine bakılmaz (son çare yolları için).
+    """
+    key = _phrase_key(text)
+    with _pinned_lock:
+        if engine is not None:
+            paths = [_pinned.get((engine, key), "")]
+        else:
+            paths = [path for (_, phrase), path in _pinned.items() if phrase == key]
+    for path in paths:
+        if path and os.path.exists(path):
+            return path
+    return ""
+
+
+def prerender(phrases: list, engine: str, module):
+    """Cümleleri yalnızca verilen motorla seslendir; yedek motora düşülmez."""
+    voice = module.voice_id()
+    rendered = 0
+    for phrase in phrases:
+        target = pinned_path(phrase, voice)
+        try:
+            if not os.path.exists(target):
+                # tts_to_file her çağrıda benzersiz bir dosya üretir ve bu dosya
+                # başka bir isteğe verilmemiştir; doğrudan yerine taşınabilir
+                wav_path = module.tts_to_file(phrase)
+                if not wav_path or not os.path.exists(wav_path):
+                    print(f"Ön seslendirme başarısız: '{phrase}'")
+                    continue
+                os.replace(wav_path, target)
+            with _pinned_lock:
+                _pinned[(engine, _phrase_key(phrase))] = target
+            rendered += 1
+        except Exception as exc:
+            print(f"Ön seslendirme hatası ('{phrase}'): {exc}")
+    print(f"Ön seslendirilmiş cümle sayısı ({engine}): {rendered}")
+
+
+def start(phrases: list, engine: str, module):
+    """Cümleleri arka planda seslendir; açılışı bekletmez."""
+    if not ENABLE_TTS_PRERENDER or not phrases:
+        return None
+    thread = threading.Thread(
+        target=prerender,
+        args=(phrases, engine, module),
+        name="tts-prerender",
+        daemon=True,
+    )
+    thread.start()
+    return thread
@@ -1,17 +1,34 @@
 # tts/tts_api.py (Temizlenmiş, duplike sil)
+import hashlib
 import os
 import re
 import time
 import unicodedata
+import uuid
 from openai import OpenAI
 
 OPENAI_KEY = os.getenv("OPENAI_API_KEY")
-client = OpenAI(api_key=OPENAI_KEY)
+# Anahtar yoksa istemci kurulmaz (OpenAI() import anında hata verir); motor zincirden düşer
+client = OpenAI(api_key=OPENAI_KEY) if OPENAI_KEY else None
 
 ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
 RESULT_DIR = os.environ.get("RESULT_DIR", os.path.join(ROOT_DIR, "result"))
 os.makedirs(RESULT_DIR, exist_ok=True)
 
+TTS_MODEL = "gpt-4o-mini-tts"
+TTS_VOICE = "ash"
+TTS_INSTRUCTIONS = "Speak like a cheerful, warm-hearted uncle who is full of life. Always sound friendly, approachable, and kind. Use a light,smiling tone, and occasionally add a gentle chuckle. Speak clearly, softening and rounding your words. Make the listener feel comfortable, safe, and happy. Maintain a positive, uplifting energy throughout the conversation."
+
+
+def is_available() -> bool:
+    return bool(OPENAI_KEY)
+
+
+def voice_id() -> str:
+    """Ses çıktısını belirleyen ayarların özeti; ön seslendirilmiş dosyaların anahtarı."""
+    instructions = hashlib.sha1(TTS_INSTRUCTIONS.encode("utf-8")).hexdigest()[:8]
+    return f"openai:{TTS_MODEL}:{TTS_VOICE}:{instructions}"
+
 
 def _slugify(text: str) -> str:
     try:
@@ -24,13 +41,14 @@ def _slugify(text: str) -> str:
 
 def tts_to_file(text: str) -> str:
     base = _slugify(text[:32])
-    filename = os.path.join(RESULT_DIR, f"{base}_{int(time.time())}.wav")
+    # Eşzamanlı istekler aynı saniyede aynı ön ekli dosyayı ezmesin
+    filename = os.path.join(RESULT_DIR, f"{base}_{int(time.time())}_{uuid.uuid4().hex[:8]}.wav")
     try:
         response = client.audio.speech.create(
-            model="gpt-4o-mini-tts",
-            voice="ash",
+            model=TTS_MODEL,
+            voice=TTS_VOICE,
             input=text,
-            instructions="Speak like a cheerful, warm-hearted uncle who is full of life. Always sound friendly, approachable, and kind. Use a light,smiling tone, and occasionally add a gentle chuckle. Speak clearly, softening and rounding your words. Make the listener feel comfortable, safe, and happy. Maintain a positive, uplifting energy throughout the conversation."
+            instructions=TTS_INSTRUCTIONS
         )
         with open(filename, "wb") as f:
             f.write(response.content)
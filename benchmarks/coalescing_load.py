@@ -0,0 +1,143 @@
+# benchmarks/coalescing_load.py - Sahte upstream'e karşı eşzamanlı yük üreteci
+#
+# ask_openai ve tts_engine.synthesize gerçek kod yolundan çağrılır, yalnızca OpenAI
+# istemcileri gecikmeli sahte nesnelerle değiştirilir. Her dalgada tüm istekler bir
+# Barrier ile aynı anda bırakılır; birleştirme açıkken upstream çağrı sayısı
+# dalgadaki farklı metin sayısını aşmamalıdır.
+#
+# Kullanım (kök dizinde):
+#   python benchmarks/coalescing_load.py --concurrency 32 --bursts 5 --latency-ms 300
+#   python benchmarks/coalescing_load.py --no-coalesce   # karşılaştırma için
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if root_dir not in sys.path:
+    sys.path.append(root_dir)
+
+QUESTIONS = [
+    "Sen kimsin?",
+    "Adın ne?",
+    "Zonguldak nasıl bir yer?",
+    "Bugün hava nasıl?",
+    "Bana bir fıkra anlat",
+    "Gazi Üniversitesi nerede?",
+]
+
+
+class FakeUpstream:
+    """OpenAI istemcisinin kullanılan kısmını taklit eder ve çağrıları sayar."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.calls = {"chat": 0, "speech": 0}
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._chat))
+        self.audio = SimpleNamespace(speech=SimpleNamespace(create=self._speech))
+
+    def _count(self, kind: str):
+        with self.lock:
+            self.calls[kind] += 1
+
+    def _chat(self, **kwargs):
+        self._count("chat")
+        time.sleep(self.latency)
+        prompt = kwargs["messages"][-1]["content"]
+        message = SimpleNamespace(content=f"Cevap koçum: {prompt}")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    def _speech(self, **kwargs):
+        self._count("speech")
+        time.sleep(self.latency)
+        return SimpleNamespace(content=b"RIFF" + kwargs["input"].encode("utf-8"))
+
+
+class _Passthrough:
+    def do(self, key, fn, *args, **kwargs):
+        return fn(*args, **kwargs)
+
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Single-flight birleştirme yük testi")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--bursts", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, default=300.0)
+    parser.add_argument("--distinct", type=int, default=3, help="Dalga başına farklı soru sayısı")
+    parser.add_argument("--no-coalesce", action="store_true")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    os.environ.setdefault("OPENAI_API_KEY", "sk-fake")
+    os.environ.setdefault("RESULT_DIR", tempfile.mkdtemp(prefix="coalesce_bench_"))
+    os.environ.setdefault("TTS_WORKERS", str(args.concurrency))
+
+    from backend.llm import openai_llm_api
+    from backend.tts import engine as tts_engine
+    from backend.tts import tts_api
+
+    upstream = FakeUpstream(args.latency_ms / 1000.0)
+    openai_llm_api.client = upstream
+    tts_api.client = upstream
+    if args.no_coalesce:
+        openai_llm_api._inflight = _Passthrough()
+        tts_engine._inflight = _Passthrough()
+
+    def visitor(question: str, barrier: threading.Barrier) -> float:
+        barrier.wait()
+        start = time.perf_counter()
+        answer = openai_llm_api.ask_openai(question)
+        tts_engine.synthesize(answer, "openai")
+        return time.perf_counter() - start
+
+    rng = random.Random(args.seed)
+    latencies = []
+    expected_max = 0
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        for _ in range(args.bursts):
+            pool_questions = rng.sample(QUESTIONS, min(args.distinct, len(QUESTIONS)))
+            burst = [rng.choice(pool_questions) for _ in range(args.concurrency)]
+            expected_max += len(set(burst))
+            barrier = threading.Barrier(args.concurrency)
+            futures = [pool.submit(visitor, q, barrier) for q in burst]
+            latencies.extend(f.result() for f in futures)
+    wall = time.perf_counter() - wall_start
+
+    requests_total = len(latencies)
+    report = {
+        "coalesce": not args.no_coalesce,
+        "requests": requests_total,
+        "upstream_chat_calls": upstream.calls["chat"],
+        "upstream_speech_calls": upstream.calls["speech"],
+        "expected_max_calls": expected_max,
+        "throughput_rps": round(requests_total / wall, 2),
+        "latency_p50_s": round(statistics.median(latencies), 4),
+        "latency_p95_s": round(percentile(latencies, 95), 4),
+        "latency_p99_s": round(percentile(latencies, 99), 4),
+    }
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+
+    if not args.no_coalesce:
+        over = max(upstream.calls["chat"], upstream.calls["speech"]) > expected_max
+        if over:
+            print("HATA: eşzamanlı aynı istekler birleştirilmedi", file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+# benchmarks/fake_openai.py - Yerel, OpenAI uyumlu sahte sunucu
+#
+# Backend'in kullandığı üç uç noktayı taklit eder:
+#   POST /v1/audio/transcriptions  (whisper-1)
+#   POST /v1/chat/completions      (gpt-4o-mini)
+#   POST /v1/audio/speech          (gpt-4o-mini-tts, parça parça WAV akışı)
+# Backend akış kullanmadığından chat cevabı tek JSON olarak döner. Gecikme, jitter,
+# ses parçaları arası bekleme ve hata oranı ayarlanabilir. Tek başına çalıştırma:
+#   python benchmarks/fake_openai.py --port 8089 --llm-latency-ms 400 --error-rate 0.05
+# ve backend'i OPENAI_BASE_URL=http://127.0.0.1:8089/v1 ile başlatın.
+import argparse
+import io
+import itertools
+import json
+import math
+import random
+import struct
+import threading
+import time
+import wave
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ANSWER = "Merhaba koçum, ben buradayım, sana nasıl yardımcı olabilirim? Hehe, sor bakalım."
+
+
+class _Server(ThreadingHTTPServer):
+    # Varsayılan 5'lik dinleme kuyruğu yüksek eşzamanlılıkta bağlantı sıfırlamalarına yol açar
+    request_queue_size = 128
+    daemon_threads = True
+
+
+@dataclass
+class FakeConfig:
+    stt_latency_ms: float = 300.0
+    llm_latency_ms: float = 400.0
+    tts_latency_ms: float = 300.0
+    jitter_ms: float = 50.0
+    chunk_delay_ms: float = 20.0
+    # Her upstream denemesi için ayrı uygulanır; istemcinin yeniden denemeleri de ayrı denemedir
+    error_rate: float = 0.0
+    # Her çağrıya farklı metin döndür; aksi halde backend aynı istekleri birleştirir
+    unique_texts: bool = True
+    seed: int = 0
+
+
+def _tone_wav(seconds: float, sample_rate: int = 24000) -> bytes:
+    frames = int(seconds * sample_rate)
+    samples = (int(3000 * math.sin(2 * math.pi * 220 * i / sample_rate)) for i in range(frames))
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(struct.pack(f"<{frames}h", *samples))
+    return buf.getvalue()
+
+
+class FakeOpenAIServer:
+    """ThreadingHTTPServer'ı arka planda çalıştırır ve çağrıları sayar."""
+
+    def __init__(self, config: FakeConfig, host: str = "127.0.0.1", port: int = 0):
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.lock = threading.Lock()
+        self.counts = {"transcriptions": 0, "chat": 0, "speech": 0, "errors": 0}
+        self.serial = itertools.count(1)
+        self.httpd = _Server((host, port), self._handler_class())
+        self.thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name="fake-openai", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def _sleep(self, base_ms: float):
+        with self.lock:
+            jitter = self.rng.uniform(-self.config.jitter_ms, self.config.jitter_ms)
+        time.sleep(max(base_ms + jitter, 0.0) / 1000.0)
+
+    def _text(self, base: str) -> str:
+        # Sayaç yerine ayrı sıra numarası: eşzamanlı cevaplar aynı sayacı okuyup aynı metni almasın
+        if not self.config.unique_texts:
+            return base
+        with self.lock:
+            return f"{base} {next(self.serial)}"
+
+    def _should_fail(self, kind: str) -> bool:
+        with self.lock:
+            self.counts[kind] += 1
+            failed = self.rng.random() < self.config.error_rate
+            if failed:
+                self.counts["errors"] += 1
+        return failed
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _read_body(self) -> bytes:
+                length = int(self.headers.get("Content-Length") or 0)
+                return self.rfile.read(length) if length else b""
+
+            def _send_json(self, status: int, payload: dict):
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _send_error(self):
+                self._send_json(500, {"error": {"message": "fake upstream error", "type": "server_error"}})
+
+            def _write_chunk(self, data: bytes):
+                self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+                self.wfile.flush()
+
+            def do_POST(self):
+                body = self._read_body()
+                path = self.path.split("?", 1)[0]
+                if path.endswith("/audio/transcriptions"):
+                    self._transcriptions()
+                elif path.endswith("/chat/completions"):
+                    self._chat(json.loads(body or b"{}"))
+                elif path.endswith("/audio/speech"):
+                    self._speech(json.loads(body or b"{}"))
+                else:
+                    self._send_json(404, {"error": {"message": f"unknown path {path}"}})
+
+            def _transcriptions(self):
+                server._sleep(server.config.stt_latency_ms)
+                if server._should_fail("transcriptions"):
+                    return self._send_error()
+                self._send_json(200, {"text": server._text("Bana bir şey anlat")})
+
+            def _chat(self, payload: dict):
+                if server._should_fail("chat"):
+                    server._sleep(server.config.llm_latency_ms)
+                    return self._send_error()
+                server._sleep(server.config.llm_latency_ms)
+                self._send_json(200, {
+                    "id": "chatcmpl-fake",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": payload.get("model", "gpt-4o-mini"),
+                    "choices": [{
+                        "index": 0,
+                        "message": {"role": "assistant", "content": server._text(ANSWER)},
+                        "finish_reason": "stop",
+                    }],
+                    "usage": {"prompt_tokens": 10, "completion_tokens": 20, "total_tokens": 30},
+                })
+
+            def _speech(self, payload: dict):
+                server._sleep(server.config.tts_latency_ms)
+                if server._should_fail("speech"):
+                    return self._send_error()
+                # Kabaca saniyede 15 karakter konuşma süresi
+                audio = _tone_wav(max(len(payload.get("input", "")) / 15.0, 0.5))
+                self.send_response(200)
+                self.send_header("Content-Type", "audio/wav")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                step = 16384
+                for offset in range(0, len(audio), step):
+                    self._write_chunk(audio[offset:offset + step])
+                    time.sleep(server.config.chunk_delay_ms / 1000.0)
+                self._write_chunk(b"")
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OpenAI uyumlu sahte sunucu")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--stt-latency-ms", type=float, default=300.0)
+    parser.add_argument("--llm-latency-ms", type=float, default=400.0)
+    parser.add_argument("--tts-latency-ms", type=float, default=300.0)
+    parser.add_argument("--jitter-ms", type=float, default=50.0)
+    parser.add_argument("--chunk-delay-ms", type=float, default=20.0, help="Ses parçaları arası bekleme")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Upstream denemesi başına hata olasılığı")
+    parser.add_argument("--repeat-texts", action="store_true", help="Her çağrıda aynı metni döndür")
+    args = parser.parse_args()
+
+    config = FakeConfig(
+        stt_latency_ms=args.stt_latency_ms,
+        llm_latency_ms=args.llm_latency_ms,
+        tts_latency_ms=args.tts_latency_ms,
+        jitter_ms=args.jitter_ms,
+        chunk_delay_ms=args.chunk_delay_ms,
+        error_rate=args.error_rate,
+        unique_texts=not args.repeat_texts,
+    )
+    server = FakeOpenAIServer(config, args.host, args.port)
+    print(f"Sahte OpenAI sunucusu: {server.base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,340 @@
+# benchmarks/frame_buffers.py - CV sıcak yolu: tampon havuzu kapalı/açık karşılaştırması
+#
+# Gerçek kod yolları çalıştırılır, yalnızca dış bağımlılıklar değiştirilir:
+#   upload_lite / upload_full: Flask test istemcisiyle /api/process_frame (backend.main)
+#   camera: UnifiedDetectionSystem okuma/işleme thread'leri, sahte VideoCapture ile
+# Her senaryo iki kez ölçülür: "unpooled" (frame_pool hiçbir diziyi saklamaz, her
+# acquire yeni ayırır) ve "pooled" (varsayılan havuz).
+#
+# MediaPipe çıkarımı ölçüme dahil değildir: mediapipe yerine RGB frame'e dokunan ve
+# sabit landmark'lar döndüren hafif bir modül yüklenir; çizimler cv2 ile frame üzerine
+# yapılır. Böylece ObjectDetector'ın tüm dalları çalışır ama yalnızca tampon yönetiminin
+# maliyeti görünür. Kamera senaryosunda işleme döngüsündeki sabit bekleme
+# --process-interval-ms ile değiştirilir (varsayılan 0: olabildiğince hızlı).
+#
+# Kullanım (kök dizinde):
+#   python benchmarks/frame_buffers.py --frames 5000 --resolutions 640x480,1280x720
+import argparse
+import base64
+import contextlib
+import gc
+import io
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from types import ModuleType, SimpleNamespace
+
+import cv2
+import numpy as np
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if root_dir not in sys.path:
+    sys.path.append(root_dir)
+
+
+def current_rss() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+# --- Sahte mediapipe ------------------------------------------------------
+
+def _landmarks(points):
+    return SimpleNamespace(landmark=[SimpleNamespace(x=x, y=y) for x, y in points])
+
+
+def install_mediapipe_stub():
+    """ObjectDetector'ın kullandığı mediapipe.solutions yüzeyini taklit eden modülü yükle."""
+
+    class _Solution:
+        result = SimpleNamespace()
+
+        def __init__(self, **kwargs):
+            pass
+
+        def process(self, rgb):
+            # Çıkarım yerine: tüm frame'i okuyan ucuz bir işlem
+            int(rgb[::8, ::8].mean())
+            return self.result
+
+    # Açık el: tüm parmak uçları eklemlerin üstünde, başparmak dışarıda
+    hand = [(0.5, 0.8)] * 21
+    hand[3], hand[4] = (0.45, 0.6), (0.50, 0.55)
+    for tip, pip, x in ((8, 6, 0.45), (12, 10, 0.5), (16, 14, 0.55), (20, 18, 0.6)):
+        hand[pip], hand[tip] = (x, 0.5), (x, 0.3)
+
+    class Hands(_Solution):
+        result = SimpleNamespace(
+            multi_hand_landmarks=[_landmarks(hand)],
+            multi_handedness=[SimpleNamespace(classification=[SimpleNamespace(label="Right")])],
+        )
+
+    class Pose(_Solution):
+        result = SimpleNamespace(pose_landmarks=_landmarks([(0.3 + i / 100, 0.2 + i / 50) for i in range(33)]))
+
+    class FaceDetection(_Solution):
+        result = SimpleNamespace(detections=[SimpleNamespace(box=(0.35, 0.15, 0.3, 0.35))])
+
+    class FaceMesh(_Solution):
+        result = SimpleNamespace(
+            multi_face_landmarks=[_landmarks([(0.4 + (i % 12) / 60, 0.2 + (i // 12) / 60) for i in range(144)])]
+        )
+
+    def draw_landmarks(image, landmark_list, connections=None, landmark_drawing_spec=None,
+                       connection_drawing_spec=None):
+        h, w = image.shape[:2]
+        for lm in landmark_list.landmark:
+            cv2.circle(image, (int(lm.x * w), int(lm.y * h)), 2, (0, 255, 0), -1)
+
+    def draw_detection(image, detection):
+        h, w = image.shape[:2]
+        x, y, bw, bh = detection.box
+        cv2.rectangle(image, (int(x * w), int(y * h)), (int((x + bw) * w), int((y + bh) * h)), (255, 0, 0), 2)
+
+    mp = ModuleType("mediapipe")
+    mp.solutions = SimpleNamespace(
+        hands=SimpleNamespace(Hands=Hands, HAND_CONNECTIONS=()),
+        pose=SimpleNamespace(Pose=Pose, POSE_CONNECTIONS=()),
+        face_detection=SimpleNamespace(FaceDetection=FaceDetection),
+        face_mesh=SimpleNamespace(FaceMesh=FaceMesh, FACEMESH_TESSELATION=()),
+        drawing_utils=SimpleNamespace(draw_landmarks=draw_landmarks, draw_detection=draw_detection),
+        drawing_styles=SimpleNamespace(
+            get_default_hand_landmarks_style=lambda: None,
+            get_default_hand_connections_style=lambda: None,
+            get_default_pose_landmarks_style=lambda: None,
+            get_default_face_mesh_tesselation_style=lambda: None,
+        ),
+    )
+    sys.modules["mediapipe"] = mp
+
+
+# --- upload senaryosu -----------------------------------------------------
+
+class UploadClient:
+    """/api/process_frame'e Flask test istemcisiyle istek gönderir."""
+
+    def __init__(self, app_module, detector, mode: str, payload: str):
+        self.app_module = app_module
+        self.detector = detector
+        self.mode = mode
+        self.client = app_module.app.test_client()
+        self.body = {"frame": f"data:image/jpeg;base64,{payload}"}
+
+    def step(self):
+        self.app_module.CV_MODE = self.mode
+        self.app_module.object_detector = self.detector
+        response = self.client.post("/api/process_frame", json=self.body)
+        if not response.get_json().get("success"):
+            raise RuntimeError(response.get_json().get("error"))
+
+
+# --- camera senaryosu -----------------------------------------------------
+
+class FakeCapture:
+    """Sabit bir kareyi döndüren VideoCapture; verilen tamponu OpenCV gibi yeniden kullanır."""
+
+    def __init__(self, source):
+        self.source = source
+
+    def isOpened(self):
+        return True
+
+    def set(self, prop, value):
+        return True
+
+    def read(self, image=None):
+        if image is None or image.shape != self.source.shape or image.dtype != self.source.dtype:
+            return True, self.source.copy()
+        np.copyto(image, self.source)
+        return True, image
+
+    def release(self):
+        pass
+
+
+class CameraRunner:
+    """UnifiedDetectionSystem'i sahte kamerayla çalıştırır; step() bir frame işlenene kadar bekler."""
+
+    def __init__(self, source, interval: float):
+        from computer_vision import unified_detection
+
+        self.module = unified_detection
+        self.original_capture = cv2.VideoCapture
+        self.original_time = unified_detection.time
+        cv2.VideoCapture = lambda index: FakeCapture(source)
+        unified_detection.time = SimpleNamespace(sleep=lambda _seconds: time.sleep(interval))
+
+        self.system = unified_detection.UnifiedDetectionSystem()
+        self.system.frame_height, self.system.frame_width = source.shape[:2]
+        self.processed = 0
+        self.cond = threading.Condition()
+        detect = self.system.object_detector.detect_objects
+
+        def counted(frame):
+            result = detect(frame)
+            with self.cond:
+                self.processed += 1
+                self.cond.notify_all()
+            return result
+
+        self.system.object_detector.detect_objects = counted
+
+    def start(self):
+        if not self.system.start_camera(0):
+            raise RuntimeError("sahte kamera başlatılamadı")
+        return self
+
+    def step(self):
+        with self.cond:
+            target = self.processed + 1
+            self.cond.wait_for(lambda: self.processed >= target)
+
+    def stop(self):
+        try:
+            self.system.stop_camera()
+        except cv2.error:
+            # Headless OpenCV'de destroyAllWindows desteklenmez
+            pass
+        self.system.read_thread.join()
+        self.system.process_thread.join()
+        cv2.VideoCapture = self.original_capture
+        self.module.time = self.original_time
+
+
+# --- ölçüm ----------------------------------------------------------------
+
+def run(step, frames: int, warmup: int) -> dict:
+    for _ in range(warmup):
+        step()
+    gc.collect()
+    collections_before = sum(stat["collections"] for stat in gc.get_stats())
+    rss_start = current_rss()
+    rss_peak = rss_start
+    latencies = []
+    for i in range(frames):
+        start = time.perf_counter()
+        step()
+        latencies.append(time.perf_counter() - start)
+        if i % 50 == 0:
+            rss_peak = max(rss_peak, current_rss())
+    rss_end = current_rss()
+    collections = sum(stat["collections"] for stat in gc.get_stats()) - collections_before
+
+    # Python ayırıcı izlemesi gecikmeyi bozmasın diye ayrı, kısa bir turda ölçülür
+    tracemalloc.start()
+    for _ in range(min(frames, 200)):
+        step()
+    _, traced_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    ordered = sorted(latencies)
+    return {
+        "frames": frames,
+        "latency_mean_ms": round(statistics.mean(latencies) * 1000, 3),
+        "latency_p50_ms": round(ordered[len(ordered) // 2] * 1000, 3),
+        "latency_p99_ms": round(ordered[min(len(ordered) - 1, int(0.99 * len(ordered)))] * 1000, 3),
+        "rss_start_mb": round(rss_start / 2**20, 1),
+        "rss_peak_mb": round(rss_peak / 2**20, 1),
+        "rss_growth_mb": round((rss_end - rss_start) / 2**20, 2),
+        "traced_peak_kb": round(traced_peak / 1024, 1),
+        "gc_collections": collections,
+    }
+
+
+def set_pooling(frame_pool, enabled: bool, max_per_shape: int):
+    frame_pool.max_per_shape = max_per_shape if enabled else 0
+    frame_pool.clear()
+    frame_pool.allocations = 0
+
+
+def synthetic_frame(width: int, height: int) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 255, size=(height, width, 3), dtype=np.uint8)
+    cv2.GaussianBlur(frame, (9, 9), 0, dst=frame)
+    return frame
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CV tampon havuzu bellek/gecikme benchmark'ı")
+    parser.add_argument("--frames", type=int, default=3000)
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--resolutions", default="640x480,1280x720")
+    parser.add_argument("--process-interval-ms", type=float, default=0.0,
+                        help="Kamera işleme döngüsündeki bekleme (uygulamada 100)")
+    parser.add_argument("--output", help="Sonuçları JSON olarak kaydet")
+    parser.add_argument("--verbose", action="store_true", help="Uygulama çıktısını gizleme")
+    args = parser.parse_args()
+
+    install_mediapipe_stub()
+    # backend.main import edilmeden önce ortamı hazırla; kamera açılmasın diye lite modda başlar
+    os.environ["ENABLE_COMPUTER_VISION"] = "true"
+    os.environ["CV_MODE"] = "lite"
+    os.environ.setdefault("OPENAI_API_KEY", "sk-fake")
+    os.environ.setdefault("RESULT_DIR", tempfile.mkdtemp(prefix="frame_bench_"))
+    os.environ.setdefault("ENABLE_TTS_PRERENDER", "false")
+    os.environ.setdefault("STT_ENGINE", "openai")
+    os.environ.setdefault("TTS_ENGINE", "openai")
+
+    app_output = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+    with app_output:
+        import backend.main as app_module
+    from computer_vision.frame_buffers import frame_pool
+    from computer_vision.object_detector import ObjectDetector
+
+    if not app_module.cv_available:
+        sys.exit("HATA: backend.main CV hattını başlatamadı")
+    detectors = {"lite": app_module.object_detector, "full": ObjectDetector()}
+    max_per_shape = frame_pool.max_per_shape
+
+    def report_result(result, resolution, scenario, variant):
+        result.update({"scenario": scenario, "variant": variant, "resolution": resolution,
+                       "pool_allocations": frame_pool.allocations})
+        report.append(result)
+        print(f"{resolution} {scenario:<12} {variant:<8} p50={result['latency_p50_ms']}ms "
+              f"p99={result['latency_p99_ms']}ms rss+={result['rss_growth_mb']}MB "
+              f"allocs={result['pool_allocations']}", file=sys.stderr)
+
+    report = []
+    for resolution in args.resolutions.split(","):
+        width, height = (int(x) for x in resolution.lower().split("x"))
+        source = synthetic_frame(width, height)
+        _, jpeg = cv2.imencode(".jpg", source)
+        payload = base64.b64encode(jpeg).decode("ascii")
+
+        for mode in ("full", "lite"):
+            for variant in ("unpooled", "pooled"):
+                set_pooling(frame_pool, variant == "pooled", max_per_shape)
+                client = UploadClient(app_module, detectors[mode], mode, payload)
+                with app_output:
+                    result = run(client.step, args.frames, args.warmup)
+                report_result(result, resolution, f"upload_{mode}", variant)
+
+        for variant in ("unpooled", "pooled"):
+            set_pooling(frame_pool, variant == "pooled", max_per_shape)
+            camera = CameraRunner(source, args.process_interval_ms / 1000.0)
+            with app_output:
+                camera.start()
+                try:
+                    result = run(camera.step, args.frames, args.warmup)
+                finally:
+                    camera.stop()
+            report_result(result, resolution, "camera", variant)
+
+    set_pooling(frame_pool, True, max_per_shape)
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
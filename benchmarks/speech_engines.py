@@ -0,0 +1,140 @@
+# benchmarks/speech_engines.py - STT/TTS motorlarının gecikme ve RTF karşılaştırması
+#
+# Kullanım (kök dizinde):
+#   python benchmarks/speech_engines.py --audio samples/*.wav --engines local,openai
+#   python benchmarks/speech_engines.py --skip-stt --phrases "Merhaba koçum" "Nasılsın?"
+#
+# RTF (real-time factor) = işlem süresi / ses süresi; 1'in altı gerçek zamandan hızlı demektir.
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import wave
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if root_dir not in sys.path:
+    sys.path.append(root_dir)
+
+DEFAULT_PHRASES = [
+    "Merhaba, nasılsın?",
+    "Ben GaziAI, Gazi Üniversitesi yapay zeka topluluğu tarafından geliştirildim.",
+    "Zonguldak çok güzel bir şehir koçum, denizi ve madenleriyle meşhurdur.",
+]
+
+
+def audio_duration(path: str) -> float:
+    try:
+        with wave.open(path, "rb") as wav_file:
+            return wav_file.getnframes() / float(wav_file.getframerate())
+    except (wave.Error, EOFError):
+        pass
+    if shutil.which("ffprobe") is None:
+        return 0.0
+    cmd = [
+        "ffprobe", "-v", "error", "-show_entries", "format=duration",
+        "-of", "default=noprint_wrappers=1:nokey=1", path,
+    ]
+    try:
+        out = subprocess.run(cmd, check=True, capture_output=True, text=True).stdout
+        return float(out.strip())
+    except (subprocess.CalledProcessError, ValueError):
+        return 0.0
+
+
+def summarize(samples: list) -> dict:
+    latencies = sorted(s["latency"] for s in samples)
+    rtfs = [s["rtf"] for s in samples if s["rtf"] is not None]
+    if not latencies:
+        return {"runs": 0}
+    p95_index = min(len(latencies) - 1, int(round(0.95 * (len(latencies) - 1))))
+    return {
+        "runs": len(latencies),
+        "latency_mean_s": round(statistics.mean(latencies), 4),
+        "latency_p50_s": round(statistics.median(latencies), 4),
+        "latency_p95_s": round(latencies[p95_index], 4),
+        "rtf_mean": round(statistics.mean(rtfs), 4) if rtfs else None,
+    }
+
+
+def bench_stt(module, audio_files: list, repeat: int) -> dict:
+    samples = []
+    for path in audio_files:
+        duration = audio_duration(path)
+        for _ in range(repeat):
+            start = time.perf_counter()
+            module.transcribe_file(path)
+            elapsed = time.perf_counter() - start
+            samples.append({"latency": elapsed, "rtf": elapsed / duration if duration else None})
+    return summarize(samples)
+
+
+def bench_tts(module, phrases: list, repeat: int) -> dict:
+    samples = []
+    for phrase in phrases:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            wav_path = module.tts_to_file(phrase)
+            elapsed = time.perf_counter() - start
+            if not wav_path:
+                continue
+            duration = audio_duration(wav_path)
+            samples.append({"latency": elapsed, "rtf": elapsed / duration if duration else None})
+            os.remove(wav_path)
+    return summarize(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="STT/TTS motor karşılaştırması")
+    parser.add_argument("--engines", default="local,openai", help="Virgülle ayrılmış motor listesi")
+    parser.add_argument("--audio", nargs="*", default=[], help="STT için ses dosyaları")
+    parser.add_argument("--phrases", nargs="*", default=DEFAULT_PHRASES, help="TTS için cümleler")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--skip-stt", action="store_true")
+    parser.add_argument("--skip-tts", action="store_true")
+    parser.add_argument("--output", help="Sonuçları JSON olarak kaydet")
+    args = parser.parse_args()
+
+    # Üretilen dosyalar asıl result/ klasörünü kirletmesin
+    os.environ.setdefault("RESULT_DIR", tempfile.mkdtemp(prefix="speech_bench_"))
+
+    from backend.stt import engine as stt_engine
+    from backend.tts import engine as tts_engine
+
+    report = {"stt": {}, "tts": {}}
+    for name in [e.strip() for e in args.engines.split(",") if e.strip()]:
+        if not args.skip_stt and args.audio:
+            module = stt_engine.ENGINES.get(name)
+            if module is None or not module.is_available():
+                print(f"STT motoru kullanılamıyor: {name}")
+            else:
+                # Model yükleme süresi ölçüme karışmasın
+                start = time.perf_counter()
+                if hasattr(module, "load_model"):
+                    module.load_model()
+                report["stt"][name] = {"load_s": round(time.perf_counter() - start, 4)}
+                report["stt"][name].update(bench_stt(module, args.audio, args.repeat))
+
+        if not args.skip_tts:
+            module = tts_engine.ENGINES.get(name)
+            if module is None or not module.is_available():
+                print(f"TTS motoru kullanılamıyor: {name}")
+            else:
+                start = time.perf_counter()
+                if hasattr(module, "load_model"):
+                    module.load_model()
+                report["tts"][name] = {"load_s": round(time.perf_counter() - start, 4)}
+                report["tts"][name].update(bench_tts(module, args.phrases, args.repeat))
+
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
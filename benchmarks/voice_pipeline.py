@@ -0,0 +1,484 @@
+# benchmarks/voice_pipeline.py - Uçtan uca ses hattı benchmark'ı
+#
+# /api/upload_audio → STT → LLM → TTS → /audio/<file> yolunu sahte OpenAI sunucusuna
+# (benchmarks/fake_openai.py) karşı, gerçek Flask uygulaması üzerinden ölçer.
+# Sentetik ses yüklemeleri (farklı süre ve formatlar) ayarlanabilir eşzamanlılıkla
+# gönderilir; cevap ve toplam gecikme yüzdelikleri, throughput ve aşama başına
+# süre/CPU/RSS raporlanır.
+#
+# Hata sayımı: STT/LLM upstream hataları kullanıcıya HTTP hatası olarak değil, sabit bir
+# cevap olarak döner; yalnızca TTS hatası isteği düşürür. Bu yüzden istek hata oranına
+# (error_rate) ek olarak aşama çağrılarının upstream hata oranı (upstream_failure_rate)
+# da raporlanır. OpenAI SDK'sı 5xx cevapları varsayılan olarak iki kez yeniden dener;
+# hatalar gecikmeye gizlenmesin diye istemciler --max-retries (varsayılan 0) ile kurulur.
+#
+# Backend cevabı akışla göndermez: /api/upload_audio JSON'u STT, LLM ve TTS bittikten
+# sonra tek seferde döner. Bu yüzden ilk bayt süresi ayrıca ölçülmez; "reply" bu
+# JSON'un alınma süresi, "total" ise ses dosyasının indirilmesi dahil süredir.
+#
+# Kullanım (kök dizinde):
+#   python benchmarks/voice_pipeline.py --concurrency 1,4,16 --requests 40
+#   python benchmarks/voice_pipeline.py --save-baseline            # referansı kaydet
+#   python benchmarks/voice_pipeline.py --baseline                 # referansla karşılaştır
+#
+# Referans sonuçlar makineye özeldir ve depoya eklenmez; CI/kiosk makinesinde üretilip
+# orada, aynı ayarlarla karşılaştırılmalıdır.
+import argparse
+import contextlib
+import http.client
+import io
+import json
+import logging
+import math
+import os
+import random
+import shutil
+import statistics
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+import wave
+from concurrent.futures import ThreadPoolExecutor
+
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if root_dir not in sys.path:
+    sys.path.append(root_dir)
+
+from benchmarks.fake_openai import FakeConfig, FakeOpenAIServer
+
+DEFAULT_BASELINE = os.path.join(root_dir, "benchmarks", "baselines", "voice_pipeline.json")
+# Karşılaştırılan metrikler ve hangi yönün kötüleşme sayıldığı
+REGRESSION_METRICS = {
+    "reply_p50_s": "higher",
+    "reply_p95_s": "higher",
+    "total_p50_s": "higher",
+    "total_p95_s": "higher",
+    "throughput_rps": "lower",
+    "error_rate": "higher",
+    "upstream_failure_rate": "higher",
+}
+# Bu metrikler göreli değil, --error-rate-tolerance ile mutlak eşikle karşılaştırılır
+RATE_METRICS = {"error_rate", "upstream_failure_rate"}
+
+
+def percentile(values: list, pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def current_rss() -> int:
+    """Anlık RSS (bayt); /proc yoksa tepe RSS'e düşer."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+# --- Sentetik ses ---------------------------------------------------------
+
+def synth_wav(seconds: float, sample_rate: int = 16000, seed: int = 0) -> bytes:
+    rng = random.Random(seed)
+    frames = int(seconds * sample_rate)
+    samples = [
+        int(4000 * math.sin(2 * math.pi * 180 * i / sample_rate) + rng.uniform(-800, 800))
+        for i in range(frames)
+    ]
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(struct.pack(f"<{frames}h", *samples))
+    return buf.getvalue()
+
+
+def build_uploads(lengths: list, formats: list, workdir: str) -> list:
+    """(dosya adı, içerik, süre) listesi; wav dışı formatlar FFmpeg ile üretilir."""
+    uploads = []
+    has_ffmpeg = shutil.which("ffmpeg") is not None
+    for seconds in lengths:
+        wav_bytes = synth_wav(seconds, seed=int(seconds * 1000))
+        for fmt in formats:
+            name = f"speech_{seconds:g}s.{fmt}"
+            if fmt == "wav":
+                uploads.append((name, wav_bytes, seconds))
+                continue
+            if not has_ffmpeg:
+                print(f"FFmpeg yok, {fmt} formatı atlanıyor", file=sys.stderr)
+                continue
+            src = os.path.join(workdir, f"src_{seconds:g}.wav")
+            dst = os.path.join(workdir, name)
+            with open(src, "wb") as f:
+                f.write(wav_bytes)
+            cmd = ["ffmpeg", "-y", "-loglevel", "error", "-i", src, dst]
+            if subprocess.run(cmd, capture_output=True).returncode != 0:
+                print(f"{fmt} dönüştürme başarısız, atlanıyor", file=sys.stderr)
+                continue
+            with open(dst, "rb") as f:
+                uploads.append((name, f.read(), seconds))
+    return uploads
+
+
+def multipart_body(filename: str, payload: bytes, fields: dict) -> tuple:
+    boundary = uuid.uuid4().hex
+    parts = []
+    for key, value in fields.items():
+        parts.append(
+            f"--{boundary}\r\nContent-Disposition: form-data; name=\"{key}\"\r\n\r\n{value}\r\n".encode("utf-8")
+        )
+    parts.append(
+        (
+            f"--{boundary}\r\nContent-Disposition: form-data; name=\"audio\"; filename=\"{filename}\"\r\n"
+            "Content-Type: application/octet-stream\r\n\r\n"
+        ).encode("utf-8") + payload + b"\r\n"
+    )
+    parts.append(f"--{boundary}--\r\n".encode("utf-8"))
+    return b"".join(parts), f"multipart/form-data; boundary={boundary}"
+
+
+# --- Aşama ölçümü ---------------------------------------------------------
+
+class StageRecorder:
+    """Sarılan fonksiyonların süre, thread CPU süresi ve RSS değişimini toplar."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = {}
+
+    def wrap(self, stage: str, fn, failed=None):
+        """failed(sonuç) True dönerse çağrı upstream hatası sayılır; exception her zaman hatadır."""
+        def wrapper(*args, **kwargs):
+            rss_before = current_rss()
+            cpu_start = time.thread_time()
+            start = time.perf_counter()
+            result, error = None, True
+            try:
+                result = fn(*args, **kwargs)
+                error = bool(failed and failed(result))
+                return result
+            finally:
+                sample = {
+                    "wall": time.perf_counter() - start,
+                    "cpu": time.thread_time() - cpu_start,
+                    "rss_delta": current_rss() - rss_before,
+                    "failed": error,
+                }
+                with self.lock:
+                    self.samples.setdefault(stage, []).append(sample)
+        return wrapper
+
+    def reset(self):
+        with self.lock:
+            self.samples = {}
+
+    def summary(self) -> dict:
+        with self.lock:
+            samples = {stage: list(values) for stage, values in self.samples.items()}
+        report = {}
+        for stage, values in samples.items():
+            walls = [v["wall"] for v in values]
+            report[stage] = {
+                "calls": len(values),
+                "failures": sum(1 for v in values if v["failed"]),
+                "wall_p50_s": round(percentile(walls, 50), 4),
+                "wall_p95_s": round(percentile(walls, 95), 4),
+                "cpu_mean_ms": round(statistics.mean(v["cpu"] for v in values) * 1000, 3),
+                "rss_delta_mean_kb": round(statistics.mean(v["rss_delta"] for v in values) / 1024, 1),
+            }
+        return report
+
+
+def instrument(recorder: StageRecorder, max_retries: int):
+    """Aşama fonksiyonlarını kendi thread'lerinde ölçülecek şekilde sar.
+
+    STT ve TTS motor thread havuzunda çalıştığından CPU süresi motor fonksiyonunda
+    ölçülür; LLM istek thread'inde çalışır. FFmpeg alt süreç CPU'su dahil değildir.
+    Aşamalar hata durumunda exception yerine işaret döndürdüğünden bunlar da hata sayılır.
+    """
+    import backend.main as app_module
+    from backend.llm import openai_llm_api
+    from backend.stt import engine as stt_engine
+    from backend.stt import openai_stt
+    from backend.tts import tts_api
+
+    for module in (openai_stt, openai_llm_api, tts_api):
+        module.client = module.client.with_options(max_retries=max_retries)
+
+    failed_answers = (openai_llm_api.ERROR_TEXT, openai_llm_api.NO_ANSWER_TEXT)
+    openai_stt.transcribe_file = recorder.wrap(
+        "stt", openai_stt.transcribe_file, lambda text: text in stt_engine.FAILED_RESULTS
+    )
+    app_module.ask_openai = recorder.wrap("llm", app_module.ask_openai, lambda answer: answer in failed_answers)
+    tts_api.tts_to_file = recorder.wrap("tts", tts_api.tts_to_file, lambda path: not path)
+
+
+# --- Yük üretimi ----------------------------------------------------------
+
+def one_request(base_url: str, upload: tuple, fields: dict, timeout: float) -> dict:
+    filename, payload, _seconds = upload
+    body, content_type = multipart_body(filename, payload, fields)
+    req = urllib.request.Request(
+        f"{base_url}/api/upload_audio",
+        data=body,
+        headers={"Content-Type": content_type},
+        method="POST",
+    )
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            data = json.loads(resp.read() or b"{}")
+        reply = time.perf_counter() - start
+        audio_url = data.get("audio_url")
+        if not audio_url:
+            return {"ok": False, "reply": reply, "total": time.perf_counter() - start}
+        with urllib.request.urlopen(f"{base_url}{audio_url}", timeout=timeout) as resp:
+            audio_bytes = len(resp.read())
+        return {
+            "ok": audio_bytes > 0,
+            "reply": reply,
+            "total": time.perf_counter() - start,
+        }
+    except (urllib.error.URLError, http.client.HTTPException, OSError, ValueError) as exc:
+        return {"ok": False, "reply": None, "total": time.perf_counter() - start, "error": str(exc)}
+
+
+def run_level(base_url: str, uploads: list, concurrency: int, requests_total: int,
+              fields: dict, timeout: float, recorder: StageRecorder) -> dict:
+    recorder.reset()
+    rss_start = current_rss()
+    rss_peak = rss_start
+    stop = threading.Event()
+
+    def sample_rss():
+        nonlocal rss_peak
+        while not stop.is_set():
+            rss_peak = max(rss_peak, current_rss())
+            stop.wait(0.05)
+
+    sampler = threading.Thread(target=sample_rss, daemon=True)
+    sampler.start()
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = [
+            pool.submit(one_request, base_url, uploads[i % len(uploads)], fields, timeout)
+            for i in range(requests_total)
+        ]
+        results = [f.result() for f in futures]
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+    stop.set()
+    sampler.join()
+
+    stages = recorder.summary()
+    stage_calls = sum(stage["calls"] for stage in stages.values())
+    stage_failures = sum(stage["failures"] for stage in stages.values())
+    ok = [r for r in results if r["ok"]]
+    replies = [r["reply"] for r in ok]
+    totals = [r["total"] for r in ok]
+    return {
+        "concurrency": concurrency,
+        "requests": requests_total,
+        "errors": requests_total - len(ok),
+        "error_rate": round((requests_total - len(ok)) / requests_total, 4),
+        "upstream_failure_rate": round(stage_failures / stage_calls, 4) if stage_calls else 0.0,
+        "throughput_rps": round(len(ok) / wall, 3),
+        "reply_p50_s": round(percentile(replies, 50), 4),
+        "reply_p95_s": round(percentile(replies, 95), 4),
+        "total_p50_s": round(percentile(totals, 50), 4),
+        "total_p90_s": round(percentile(totals, 90), 4),
+        "total_p95_s": round(percentile(totals, 95), 4),
+        "total_p99_s": round(percentile(totals, 99), 4),
+        "process_cpu_s": round(cpu, 3),
+        "rss_start_mb": round(rss_start / 2**20, 1),
+        "rss_peak_mb": round(rss_peak / 2**20, 1),
+        "stages": stages,
+    }
+
+
+# --- Referans karşılaştırma -----------------------------------------------
+
+def _flatten(config: dict, prefix: str = "") -> dict:
+    flat = {}
+    for key, value in config.items():
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{prefix}{key}."))
+        else:
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+
+def config_differences(report: dict, baseline: dict) -> list:
+    """Referansla farklı olan ayarlar; farklı ayarlarla alınmış sonuçlar karşılaştırılamaz."""
+    current = _flatten(report.get("config", {}))
+    reference = _flatten(baseline.get("config", {}))
+    return [
+        f"{key}: {reference.get(key)} -> {current.get(key)}"
+        for key in sorted(set(current) | set(reference))
+        if current.get(key) != reference.get(key)
+    ]
+
+
+def compare(report: dict, baseline: dict, tolerance: float, error_rate_tolerance: float) -> list:
+    """tolerance gecikme/throughput için göreli, error_rate_tolerance hata oranı için mutlak eşiktir."""
+    failures = []
+    base_levels = {level["concurrency"]: level for level in baseline.get("levels", [])}
+    for level in report["levels"]:
+        ref = base_levels.get(level["concurrency"])
+        if ref is None:
+            continue
+        for metric, worse in REGRESSION_METRICS.items():
+            old, new = ref.get(metric), level.get(metric)
+            if old is None or new is None:
+                continue
+            if metric in RATE_METRICS:
+                regressed = new > old + error_rate_tolerance
+            elif worse == "higher":
+                regressed = new > old * (1 + tolerance)
+            else:
+                regressed = new < old * (1 - tolerance)
+            if regressed:
+                failures.append(f"c={level['concurrency']} {metric}: {old} -> {new}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Uçtan uca ses hattı benchmark'ı")
+    parser.add_argument("--concurrency", default="1,4,16", help="Virgülle ayrılmış eşzamanlılık seviyeleri")
+    parser.add_argument("--requests", type=int, default=40, help="Seviye başına istek sayısı")
+    parser.add_argument("--lengths", default="1,3,8", help="Sentetik ses süreleri (saniye)")
+    parser.add_argument("--formats", default="wav,webm,ogg", help="Yükleme formatları (wav dışı FFmpeg ister)")
+    parser.add_argument("--stt-latency-ms", type=float, default=300.0)
+    parser.add_argument("--llm-latency-ms", type=float, default=400.0)
+    parser.add_argument("--tts-latency-ms", type=float, default=300.0)
+    parser.add_argument("--jitter-ms", type=float, default=50.0)
+    parser.add_argument("--chunk-delay-ms", type=float, default=20.0, help="Sahte TTS ses parçaları arası bekleme")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="Sahte sunucunun her upstream denemesinde hata döndürme olasılığı")
+    parser.add_argument("--max-retries", type=int, default=0,
+                        help="OpenAI istemcilerinin yeniden deneme sayısı (SDK varsayılanı 2)")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--output", help="Raporu JSON olarak kaydet")
+    parser.add_argument("--baseline", nargs="?", const=DEFAULT_BASELINE, help="Karşılaştırılacak referans JSON")
+    parser.add_argument("--save-baseline", nargs="?", const=DEFAULT_BASELINE, help="Raporu referans olarak kaydet")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Gecikme/throughput için izin verilen göreli kötüleşme")
+    parser.add_argument("--error-rate-tolerance", type=float, default=0.02,
+                        help="Hata oranı için izin verilen mutlak artış (0.02 = 2 puan)")
+    parser.add_argument("--allow-config-mismatch", action="store_true",
+                        help="Referans farklı ayarlarla alındıysa reddetmek yerine uyar")
+    parser.add_argument("--verbose", action="store_true", help="Uygulama loglarını gizleme")
+    args = parser.parse_args()
+
+    config = FakeConfig(
+        stt_latency_ms=args.stt_latency_ms,
+        llm_latency_ms=args.llm_latency_ms,
+        tts_latency_ms=args.tts_latency_ms,
+        jitter_ms=args.jitter_ms,
+        chunk_delay_ms=args.chunk_delay_ms,
+        error_rate=args.error_rate,
+    )
+    fake = FakeOpenAIServer(config).start()
+
+    # backend.main import edilmeden önce ortamı hazırla
+    workdir = tempfile.mkdtemp(prefix="voice_bench_")
+    os.environ["OPENAI_BASE_URL"] = fake.base_url
+    os.environ["OPENAI_API_KEY"] = "sk-fake"
+    os.environ["RESULT_DIR"] = os.path.join(workdir, "result")
+    os.environ["ENABLE_COMPUTER_VISION"] = "false"
+    os.environ.setdefault("ENABLE_TTS_PRERENDER", "false")
+    os.environ.setdefault("STT_ENGINE", "openai")
+    os.environ.setdefault("TTS_ENGINE", "openai")
+
+    from werkzeug.serving import make_server
+
+    # Uygulamanın print çıktısı stdout'taki JSON raporu bozmasın
+    app_output = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+    with app_output:
+        import backend.main as app_module
+
+    if not args.verbose:
+        logging.getLogger("werkzeug").setLevel(logging.ERROR)
+
+    recorder = StageRecorder()
+    instrument(recorder, args.max_retries)
+    server = make_server("127.0.0.1", 0, app_module.app, threaded=True)
+    threading.Thread(target=server.serve_forever, name="flask-bench", daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+
+    lengths = [float(x) for x in args.lengths.split(",") if x.strip()]
+    formats = [x.strip() for x in args.formats.split(",") if x.strip()]
+    uploads = build_uploads(lengths, formats, workdir)
+    levels = [int(x) for x in args.concurrency.split(",") if x.strip()]
+
+    report = {
+        "config": {
+            "lengths_s": lengths,
+            "formats": sorted({name.rsplit(".", 1)[1] for name, _, _ in uploads}),
+            "requests_per_level": args.requests,
+            "stt_engine": os.environ["STT_ENGINE"],
+            "tts_engine": os.environ["TTS_ENGINE"],
+            "openai_max_retries": args.max_retries,
+            "fake_upstream": vars(config),
+        },
+        "levels": [],
+    }
+    try:
+        for concurrency in levels:
+            with app_output:
+                level = run_level(base_url, uploads, concurrency, args.requests, {}, args.timeout, recorder)
+            report["levels"].append(level)
+            print(
+                f"c={concurrency}: {level['throughput_rps']} rps, "
+                f"reply p50={level['reply_p50_s']}s, total p95={level['total_p95_s']}s, "
+                f"errors={level['errors']}, upstream failures={level['upstream_failure_rate']}",
+                file=sys.stderr,
+            )
+    finally:
+        server.shutdown()
+        fake.stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+    report["upstream_calls"] = dict(fake.counts)
+
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save_baseline)), exist_ok=True)
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"Referans kaydedildi: {args.save_baseline}", file=sys.stderr)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        differences = config_differences(report, baseline)
+        if differences:
+            print("\nReferans farklı ayarlarla alınmış:", file=sys.stderr)
+            for difference in differences:
+                print(f"  {difference}", file=sys.stderr)
+            if not args.allow_config_mismatch:
+                print("Karşılaştırma yapılmadı (--allow-config-mismatch ile zorlayın).", file=sys.stderr)
+                sys.exit(2)
+        failures = compare(report, baseline, args.tolerance, args.error_rate_tolerance)
+        if failures:
+            print("\n!!! PERFORMANS GERİLEMESİ !!!", file=sys.stderr)
+            for failure in failures:
+                print(f"  {failure}", file=sys.stderr)
+            sys.exit(1)
+        print("Referansa göre gerileme yok.", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
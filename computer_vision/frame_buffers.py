@@ -0,0 +1,49 @@
+import threading
+
+import numpy as np
+
+
+class FramePool:
+    """Çözünürlüğe göre anahtarlanmış, yeniden kullanılabilir frame dizileri havuzu.
+
+    Sıcak yoldaki resize/cvtColor hedefleri her frame'de yeniden ayrılmak yerine
+    buradan alınır ve iş bitince geri verilir. Her şekil için en fazla
+    max_per_shape dizi saklanır; fazlası çöp toplayıcıya bırakılır.
+    """
+
+    def __init__(self, max_per_shape=4):
+        self.max_per_shape = max_per_shape
+        self._free = {}
+        self._lock = threading.Lock()
+        self.allocations = 0
+
+    @staticmethod
+    def _key(shape, dtype):
+        return tuple(shape), np.dtype(dtype).str
+
+    def acquire(self, shape, dtype=np.uint8):
+        """Verilen şekilde bir dizi döndür; içeriği tanımsızdır."""
+        key = self._key(shape, dtype)
+        with self._lock:
+            free = self._free.get(key)
+            if free:
+                return free.pop()
+            self.allocations += 1
+        return np.empty(shape, dtype=dtype)
+
+    def release(self, array):
+        """Diziyi havuza geri ver; çağıran artık diziyi kullanmamalıdır."""
+        if array is None or not array.flags.c_contiguous or not array.flags.owndata:
+            return
+        key = self._key(array.shape, array.dtype)
+        with self._lock:
+            free = self._free.setdefault(key, [])
+            if len(free) < self.max_per_shape and not any(a is array for a in free):
+                free.append(array)
+
+    def clear(self):
+        with self._lock:
+            self._free.clear()
+
+
+frame_pool = FramePool()
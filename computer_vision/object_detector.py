@@ -1,7 +1,10 @@
 import cv2
 import mediapipe as mp
+import threading
 import time
 
+from .frame_buffers import frame_pool
+
 
 class ObjectDetector:
     def __init__(self, *, enable_pose=True, enable_face_detection=True, enable_face_mesh=True):
@@ -39,6 +42,8 @@ class ObjectDetector:
         self.enable_face_detection = enable_face_detection
         self.enable_face_mesh = enable_face_mesh
 
+        # MediaPipe grafikleri thread-safe değil; eşzamanlı istekler sırayla işlenir
+        self._lock = threading.Lock()
         self.fps = 0
         self.detection_results = {
             'objects': [],
@@ -81,20 +86,33 @@ class ObjectDetector:
         return None
 
     def detect_objects(self, frame):
-        """Frame'deki nesneleri, elleri, y?zleri ve pozlar? tespit et."""
-        try:
-            start_time = time.time()
+        """Frame'deki nesneleri, elleri, y?zleri ve pozlar? tespit et.
 
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            rgb_frame.flags.writeable = False
+        Çizimler frame üzerine yerinde yapılır; frame'in sahibi çağırandır.
+        Sonuç sözlüğü çağırana ait bir kopyadır.
+        """
+        with self._lock:
+            frame, results = self._detect_objects(frame)
+            return frame, dict(results)
 
-            hands_results = self.hands.process(rgb_frame) if self.hands else None
-            pose_results = self.pose.process(rgb_frame) if self.pose else None
-            face_results = self.face_detection.process(rgb_frame) if self.face_detection else None
-            face_mesh_results = self.face_mesh.process(rgb_frame) if self.face_mesh else None
+    def _detect_objects(self, frame):
+        try:
+            start_time = time.time()
 
-            rgb_frame.flags.writeable = True
-            frame = cv2.cvtColor(rgb_frame, cv2.COLOR_RGB2BGR)
+            # RGB kopyası havuzdan gelir; BGR frame zaten elimizde, geri dönüşüme gerek yok
+            rgb_frame = None
+            try:
+                rgb_frame = frame_pool.acquire(frame.shape, frame.dtype)
+                rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=rgb_frame)
+                rgb_frame.flags.writeable = False
+                hands_results = self.hands.process(rgb_frame) if self.hands else None
+                pose_results = self.pose.process(rgb_frame) if self.pose else None
+                face_results = self.face_detection.process(rgb_frame) if self.face_detection else None
+                face_mesh_results = self.face_mesh.process(rgb_frame) if self.face_mesh else None
+            finally:
+                if rgb_frame is not None:
+                    rgb_frame.flags.writeable = True
+                    frame_pool.release(rgb_frame)
 
             self.detection_results = {
                 'objects': [],
@@ -174,7 +192,8 @@ class ObjectDetector:
             return frame, self.detection_results
 
     def get_detection_results(self):
-        return self.detection_results
+        with self._lock:
+            return dict(self.detection_results)
 
     def get_fps(self):
         return self.fps
@@ -1,6 +1,7 @@
 import cv2
 import threading
 import time
+from .frame_buffers import frame_pool
 from .object_detector import ObjectDetector
 
 class UnifiedDetectionSystem:
@@ -8,6 +9,8 @@ class UnifiedDetectionSystem:
         self.object_detector = ObjectDetector()
         self.current_frame = None
         self.processed_frame = None
+        # current_frame/processed_frame sahipliği bu kilit altında thread'ler arasında devredilir
+        self._frame_lock = threading.Lock()
         self.is_running = False
         self.cap = None
         self.detection_results = {
@@ -60,9 +63,22 @@ class UnifiedDetectionSystem:
 
     def _read_frames(self):
         """Sürekli frame okuma - MÜMKÜN OLDUĞUNCA HIZLI"""
+        frame_shape = (self.frame_height, self.frame_width, 3)
+        buffer = None
         while self.is_running:
-            ret, frame = self.cap.read()
-            if ret:
+            if buffer is None:
+                buffer = frame_pool.acquire(frame_shape)
+            ret, frame = self.cap.read(buffer)
+            if not ret:
+                continue
+            if frame is not buffer:
+                # Kamera istenen çözünürlüğü vermediyse OpenCV yeni dizi ayırır
+                frame_pool.release(buffer)
+                frame_shape = frame.shape
+            # Frame işleme thread'ine devredilir; işlenmeden ezilen eski frame
+            # bir sonraki okumanın tamponu olur
+            with self._frame_lock:
+                buffer = self.current_frame
                 self.current_frame = frame
             # Sleep SÜRESİNİ AZALT veya KALDIR for maximum reading speed
             # time.sleep(0.001) # Çok kısa bir bekleme
@@ -70,18 +86,24 @@ class UnifiedDetectionSystem:
     def _process_frames(self):
         """Sürekli frame işleme - İŞLEME HIZINI AYARLA"""
         while self.is_running:
-            if self.current_frame is not None:
-                try:
-                    # Frame'i kopyala
-                    frame = self.current_frame.copy()
+            # Kopyalamak yerine son frame'in sahipliğini al; okuma thread'i yenisine yazar
+            with self._frame_lock:
+                frame = self.current_frame
+                self.current_frame = None
 
+            if frame is not None:
+                try:
                     # Nesne tespiti (Bu işlem CPU yoğun, onu yavaşlatıyor)
                     processed_frame, results = self.object_detector.detect_objects(frame)
-                    self.processed_frame = processed_frame
-
-                    # Sonuçları güncelle
+                    with self._frame_lock:
+                        previous = self.processed_frame
+                        self.processed_frame = processed_frame
+                    if previous is not None and previous is not processed_frame:
+                        frame_pool.release(previous)
+
+                    # Sonuçları güncelle (results bu thread'e ait bir kopya, yayınlamadan önce doldur)
+                    results['fps'] = self.object_detector.get_fps()
                     self.detection_results = results
-                    self.detection_results['fps'] = self.object_detector.get_fps()
 
                 except Exception as e:
                     print(f"Frame işleme hatası: {e}")
@@ -90,8 +112,16 @@ class UnifiedDetectionSystem:
             time.sleep(0.1)  # Saniyede ~10 frame işle (10 FPS)
 
     def get_processed_frame(self):
-        """İşlenmiş frame'i döndür"""
-        return self.processed_frame
+        """İşlenmiş frame'in kopyasını döndür.
+
+        Asıl tampon bir sonraki frame işlendiğinde havuza geri döner ve yeniden
+        yazılır; bu yüzden her çağrı frame boyutunda yeni bir dizi ayırır.
+        Kopya çağırana aittir, havuza geri verilmemelidir.
+        """
+        with self._frame_lock:
+            if self.processed_frame is None:
+                return None
+            return self.processed_frame.copy()
 
     def get_detection_results(self):
         """Tespit sonuçlarını döndür"""